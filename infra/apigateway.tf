@@ -4,6 +4,10 @@
 
 resource "aws_api_gateway_rest_api" "stocks_api" {
   name = "${local.name_prefix}-api"
+
+  # gzip/deflate responses when the client sends Accept-Encoding.
+  # Payloads under 1 KB are returned as-is (compression would not pay off).
+  minimum_compression_size = "1024"
 }
 
 resource "aws_api_gateway_resource" "movers" {
@@ -103,7 +107,8 @@ resource "aws_api_gateway_deployment" "stocks_api" {
 
   triggers = {
     redeploy = sha1(jsonencode({
-      resource = aws_api_gateway_resource.movers.id
+      resource                 = aws_api_gateway_resource.movers.id
+      minimum_compression_size = aws_api_gateway_rest_api.stocks_api.minimum_compression_size
 
       get_movers_method      = aws_api_gateway_method.get_movers.id
       get_movers_integration = aws_api_gateway_integration.get_movers.id
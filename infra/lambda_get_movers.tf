@@ -2,6 +2,9 @@ data "archive_file" "get_movers_zip" {
   type        = "zip"
   source_dir  = "${path.module}/../lambdas/get_movers"
   output_path = "${path.module}/../dist/get_movers.zip"
+
+  # Keep local bytecode caches out of the deployed zip
+  excludes = ["__pycache__"]
 }
 
 resource "aws_lambda_function" "get_movers" {
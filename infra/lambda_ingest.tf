@@ -2,6 +2,9 @@ data "archive_file" "ingest_zip" {
   type        = "zip"
   source_dir  = "${path.module}/../lambdas/ingest_mover"
   output_path = "${path.module}/../dist/ingest_mover.zip"
+
+  # Keep local bytecode caches out of the deployed zip
+  excludes = ["__pycache__"]
 }
 
 resource "aws_lambda_function" "ingest_mover" {
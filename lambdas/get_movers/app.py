@@ -1,75 +1,68 @@
 import os
 import json
 import logging
-from decimal import Decimal
 
 import boto3
-from boto3.dynamodb.conditions import Key
 
 # CloudWatch logging (Lambda captures stdout/stderr + logging)
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource("dynamodb")
+# Low-level client: skips the resource layer's TypeDeserializer / Decimal wrapping
+_ddb = boto3.client("dynamodb")
+_TABLE_NAME = os.environ.get("TABLE_NAME")
 
 
-def _to_jsonable(x):
-    """DynamoDB returns Decimal for numbers; JSON can't serialize Decimal."""
-    if isinstance(x, list):
-        return [_to_jsonable(v) for v in x]
-    if isinstance(x, dict):
-        return {k: _to_jsonable(v) for k, v in x.items()}
-    if isinstance(x, Decimal):
-        return float(x)
-    return x
-
-
-def _resp(status_code: int, body_obj):
-    # CORS headers so frontend can call API Gateway cleanly
+def _public_item(av: dict) -> dict:
+    """Map a projected DynamoDB AttributeValue item to the API contract / PDF fields."""
     return {
-        "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token",
-            "Access-Control-Allow-Methods": "GET,OPTIONS",
-        },
-        "body": json.dumps(body_obj),
+        "Date": av["Date"]["S"],
+        "Ticker": av["Ticker"]["S"],
+        "PercentChange": float(av["PercentChange"]["N"]),
+        "ClosingPrice": float(av["ClosingPrice"]["N"]),
     }
 
 
-def _public_item(item: dict) -> dict:
-    """Return only the fields required by the API contract / PDF."""
+# CORS headers so frontend can call API Gateway cleanly (shared by every response; never mutated)
+_CORS_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token",
+    "Access-Control-Allow-Methods": "GET,OPTIONS",
+}
+
+
+def _resp(status_code: int, body_obj):
     return {
-        "Date": item.get("Date"),
-        "Ticker": item.get("Ticker"),
-        "PercentChange": item.get("PercentChange"),
-        "ClosingPrice": item.get("ClosingPrice"),
+        "statusCode": status_code,
+        "headers": _CORS_HEADERS,
+        "body": json.dumps(body_obj, separators=(",", ":")),
     }
 
 
 def handler(event, context):
     request_id = getattr(context, "aws_request_id", "unknown")
-    table_name = os.environ.get("TABLE_NAME")
 
-    if not table_name:
+    if not _TABLE_NAME:
         logger.error("[%s] Missing TABLE_NAME env var", request_id)
         return _resp(500, {"error": "Internal server error"})
 
-    table = dynamodb.Table(table_name)
-
     try:
-        out = table.query(
-            KeyConditionExpression=Key("pk").eq("MOVERS"),
+        out = _ddb.query(
+            TableName=_TABLE_NAME,
+            KeyConditionExpression="pk = :pk",
+            ExpressionAttributeValues={":pk": {"S": "MOVERS"}},
             ScanIndexForward=False,  # newest first
             Limit=7,
+            # Only the fields required by the API contract / PDF (no pk/sk)
+            ProjectionExpression="#dt,Ticker,PercentChange,ClosingPrice",
+            ExpressionAttributeNames={"#dt": "Date"},
         )
 
-        items = out.get("Items", [])
-        public_items = [_public_item(item) for item in items]
+        public_items = [_public_item(item) for item in out.get("Items", [])]
 
         logger.info("[%s] Returned %d mover records", request_id, len(public_items))
-        return _resp(200, _to_jsonable(public_items))
+        return _resp(200, public_items)
 
     except Exception as e:
         # Logs full stack trace to CloudWatch (good for debugging, not exposed to clients)
@@ -1,34 +1,73 @@
 import json
+import logging
 import os
 import random
+import threading
 import time
-import urllib.error
-import urllib.request
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
 from decimal import Decimal, ROUND_HALF_UP
 
 import boto3
+import urllib3
 from botocore.exceptions import ClientError
 
+# CloudWatch logging (Lambda captures stdout/stderr + logging)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
 WATCHLIST = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA"]
 
 _ssm = boto3.client("ssm")
 _cached_api_key = None
+_cached_api_key_at = 0.0
+
+# Re-read SSM periodically so a manually rotated key reaches warm containers
+_API_KEY_TTL_SECONDS = 900.0
+
+_dynamodb = boto3.resource("dynamodb")
+_table = None
+
+# Shared keep-alive pool: reuses the Massive TCP+TLS connection across ticker
+# requests, worker threads, and warm invocations. Retries are handled below.
+_http = urllib3.PoolManager(num_pools=1, maxsize=8, retries=False)
+
+
+def _load_massive_api_key(param_name: str) -> str:
+    global _cached_api_key, _cached_api_key_at
+    resp = _ssm.get_parameter(Name=param_name, WithDecryption=True)
+    _cached_api_key = resp["Parameter"]["Value"]
+    _cached_api_key_at = time.monotonic()
+    return _cached_api_key
 
 
 def _get_massive_api_key() -> str:
     """Fetch Massive API key from SSM Parameter Store (SecureString). Cache across warm invocations."""
-    global _cached_api_key
-    if _cached_api_key:
+    if _cached_api_key and time.monotonic() - _cached_api_key_at < _API_KEY_TTL_SECONDS:
         return _cached_api_key
 
     param_name = os.environ.get("MASSIVE_API_KEY_PARAM")
     if not param_name:
         raise RuntimeError("Missing env var MASSIVE_API_KEY_PARAM")
 
-    resp = _ssm.get_parameter(Name=param_name, WithDecryption=True)
-    _cached_api_key = resp["Parameter"]["Value"]
-    return _cached_api_key
+    return _load_massive_api_key(param_name)
+
+
+# Fetch the key during init so the first invocation doesn't pay the SSM round trip.
+# Failures here are deferred to _get_massive_api_key(), which raises inside the handler.
+if os.environ.get("MASSIVE_API_KEY_PARAM"):
+    try:
+        _load_massive_api_key(os.environ["MASSIVE_API_KEY_PARAM"])
+    except Exception:
+        logger.warning("SSM prefetch failed; will retry in handler", exc_info=True)
+
+
+def _get_table():
+    """DynamoDB Table for TABLE_NAME. Cache across warm invocations."""
+    global _table
+    if _table is None:
+        _table = _dynamodb.Table(_get_env("TABLE_NAME"))
+    return _table
 
 
 def _get_env(name: str, default: str | None = None) -> str:
@@ -38,13 +77,26 @@ def _get_env(name: str, default: str | None = None) -> str:
     return v
 
 
+# Pacing / retry knobs are fixed per deployment; parse them once per container.
+# Stable default: 12.5s spacing => 6 calls ~ 62.5s (helps avoid RPM caps)
+_SPACING_S = float(_get_env("REQUEST_SPACING_SECONDS", "12.5"))
+_MAX_ATTEMPTS = int(_get_env("MAX_ATTEMPTS", "4"))
+_BASE_429 = float(_get_env("BASE_429_BACKOFF_SECONDS", "2"))
+_BASE_5XX = float(_get_env("BASE_5XX_BACKOFF_SECONDS", "0.5"))
+_MAX_BACKOFF = float(_get_env("MAX_BACKOFF_SECONDS", "10"))
+
+
 def _sleep_jitter(seconds: float) -> None:
     # small jitter helps avoid synchronized retries
-    time.sleep(max(0.0, seconds) + random.uniform(0.0, 0.25))
+    time.sleep(max(0.0, seconds) + random.random() * 0.25)
+
+
+# Prebuilt quantizers for the precisions we store; other values are built on demand
+_QUANTIZERS = {2: Decimal("1.00"), 6: Decimal("1.000000")}
 
 
 def _to_ddb_number(x: float, places: int = 6) -> Decimal:
-    q = Decimal("1." + ("0" * places))
+    q = _QUANTIZERS.get(places) or Decimal("1." + ("0" * places))
     return Decimal(str(x)).quantize(q, rounding=ROUND_HALF_UP)
 
 
@@ -52,73 +104,83 @@ class SmoothRateLimiter:
     """
     Ensures at least min_interval seconds between outbound API calls.
     We pace requests to avoid rate limiting.
+
+    Thread-safe: worker threads queue on the lock, so the spacing applies
+    globally while each request's network time still overlaps the others.
     """
 
     def __init__(self, min_interval_seconds: float):
         self.min_interval = max(0.0, float(min_interval_seconds))
-        self.next_allowed = time.time()
+        self.next_allowed = 0.0  # first acquire() never waits
+        self._lock = threading.Lock()
 
     def acquire(self):
-        now = time.time()
-        if now < self.next_allowed:
-            _sleep_jitter(self.next_allowed - now)
-        now2 = time.time()
-        self.next_allowed = now2 + self.min_interval
-
-
-def _fetch_json(url: str, timeout_seconds: int = 15) -> dict:
-    req = urllib.request.Request(url, headers={"Accept": "application/json"})
-    with urllib.request.urlopen(req, timeout=timeout_seconds) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+        with self._lock:
+            now = time.monotonic()
+            if now < self.next_allowed:
+                _sleep_jitter(self.next_allowed - now)
+            now2 = time.monotonic()
+            self.next_allowed = now2 + self.min_interval
 
 
 def _fetch_json_with_retries(url: str) -> dict:
-    max_attempts = int(_get_env("MAX_ATTEMPTS", "4"))
-    base_429 = float(_get_env("BASE_429_BACKOFF_SECONDS", "2"))
-    base_5xx = float(_get_env("BASE_5XX_BACKOFF_SECONDS", "0.5"))
-    max_backoff = float(_get_env("MAX_BACKOFF_SECONDS", "10"))
-
+    """
+    GET url and parse JSON, retrying 429/5xx and network errors with bounded exp backoff + jitter.
+    HTTP status is branched on directly; only transport/parse failures go through exceptions.
+    """
     last_err: Exception | None = None
 
-    for attempt in range(1, max_attempts + 1):
+    for attempt in range(1, _MAX_ATTEMPTS + 1):
         try:
-            return _fetch_json(url, timeout_seconds=15)
-
-        except urllib.error.HTTPError as e:
-            status = e.code
-            try:
-                body = e.read().decode("utf-8")
-            except Exception:
-                body = ""
-
-            last_err = RuntimeError(f"HTTPError {status} from Massive. Body={body}")
-
-            # 429: Retry-After is missing, so do bounded exp backoff + jitter.
-            if status == 429 and attempt < max_attempts:
-                print(f"[WARN] 429 for {url} attempt {attempt}, backing off")
-                sleep_s = min(max_backoff, base_429 * (2 ** (attempt - 1)))
-                _sleep_jitter(sleep_s)
-                continue
-
-            # 5xx: also retry
-            if status in (500, 502, 503, 504) and attempt < max_attempts:
-                sleep_s = min(max_backoff, base_5xx * (2 ** (attempt - 1)))
-                _sleep_jitter(sleep_s)
-                continue
-
-            raise last_err
+            resp = _http.request(
+                "GET",
+                url,
+                headers={"Accept": "application/json"},
+                timeout=urllib3.Timeout(connect=5.0, read=15.0),
+            )
+            if resp.status == 200:
+                # json.loads accepts bytes directly; skip the intermediate str copy
+                return json.loads(resp.data)
 
         except Exception as e:
+            # Connection / timeout / malformed body: same backoff as 5xx
             last_err = e
-            if attempt < max_attempts:
-                sleep_s = min(max_backoff, base_5xx * (2 ** (attempt - 1)))
+            if attempt < _MAX_ATTEMPTS:
+                sleep_s = min(_MAX_BACKOFF, _BASE_5XX * (2 ** (attempt - 1)))
                 _sleep_jitter(sleep_s)
                 continue
             raise
 
+        status = resp.status
+
+        # 429: Retry-After is missing, so do bounded exp backoff + jitter.
+        if status == 429 and attempt < _MAX_ATTEMPTS:
+            # Path only: the query string carries the API key
+            logger.warning("429 for %s attempt %d, backing off", url.split("?", 1)[0], attempt)
+            sleep_s = min(_MAX_BACKOFF, _BASE_429 * (2 ** (attempt - 1)))
+            _sleep_jitter(sleep_s)
+            continue
+
+        # 5xx: also retry
+        if status in (500, 502, 503, 504) and attempt < _MAX_ATTEMPTS:
+            sleep_s = min(_MAX_BACKOFF, _BASE_5XX * (2 ** (attempt - 1)))
+            _sleep_jitter(sleep_s)
+            continue
+
+        body = resp.data.decode("utf-8", errors="replace")
+        raise RuntimeError(f"HTTPError {status} from Massive. Body={body}")
+
     raise last_err if last_err else RuntimeError("Unknown error fetching Massive JSON")
 
 
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _utc_date_str(ts_ms: int) -> str:
+    """YYYY-MM-DD (UTC) for an epoch-ms timestamp, via whole days since epoch (no strftime)."""
+    return date.fromordinal(_EPOCH_ORDINAL + ts_ms // 86_400_000).isoformat()
+
+
 def _fetch_prev_day_open_close(symbol: str, api_key: str) -> tuple[str, float, float]:
     base_url = _get_env("MASSIVE_BASE_URL").rstrip("/")
     url = f"{base_url}/v2/aggs/ticker/{symbol}/prev?adjusted=true&apiKey={api_key}"
@@ -131,9 +193,7 @@ def _fetch_prev_day_open_close(symbol: str, api_key: str) -> tuple[str, float, f
     open_price = float(r0["o"])
     close_price = float(r0["c"])
 
-    ts_ms = int(r0["t"])
-    dt = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc)
-    date_str = dt.strftime("%Y-%m-%d")
+    date_str = _utc_date_str(int(r0["t"]))
 
     return date_str, open_price, close_price
 
@@ -144,23 +204,41 @@ def _percent_change(open_price: float, close_price: float) -> float:
     return ((close_price - open_price) / open_price) * 100.0
 
 
+def _fetch_ticker_move(
+    ticker: str, api_key: str, trading_date: str, limiter: SmoothRateLimiter
+) -> dict:
+    """Paced fetch for one ticker; runs on a worker thread."""
+    limiter.acquire()
+    date_str, o, c = _fetch_prev_day_open_close(ticker, api_key)
+
+    if date_str != trading_date:
+        raise RuntimeError(f"Date mismatch: expected {trading_date}, got {date_str}")
+
+    pct = _percent_change(o, c)
+    return {
+        "Ticker": ticker,
+        "PercentChange": round(pct, 6),
+        "ClosingPrice": round(c, 6),
+    }
+
+
 def handler(event, context):
-    table_name = _get_env("TABLE_NAME")
+    table = _get_table()
     api_key = _get_massive_api_key()
 
-    # Stable default: 12.5s spacing => 6 calls ~ 62.5s (helps avoid RPM caps)
-    spacing_s = float(_get_env("REQUEST_SPACING_SECONDS", "12.5"))
-    limiter = SmoothRateLimiter(spacing_s)
-
-    dynamodb = boto3.resource("dynamodb")
-    table = dynamodb.Table(table_name)
+    limiter = SmoothRateLimiter(_SPACING_S)
 
     # --- Step 1: Make ONE request to learn trading_date, then short-circuit if already stored ---
     limiter.acquire()
     trading_date, o0, c0 = _fetch_prev_day_open_close(WATCHLIST[0], api_key)
 
     try:
-        existing = table.get_item(Key={"pk": "MOVERS", "sk": trading_date}).get("Item")
+        # Only fetch the fields echoed back below; pk/sk are already known from the key.
+        existing = table.get_item(
+            Key={"pk": "MOVERS", "sk": trading_date},
+            ProjectionExpression="#d,Ticker,PercentChange,ClosingPrice",
+            ExpressionAttributeNames={"#d": "Date"},
+        ).get("Item")
     except ClientError as e:
         raise RuntimeError(f"DynamoDB get_item failed: {e}")
 
@@ -174,8 +252,8 @@ def handler(event, context):
                     "message": "already_stored",
                     "tradingDate": trading_date,
                     "item": {
-                        "pk": existing["pk"],
-                        "sk": existing["sk"],
+                        "pk": "MOVERS",
+                        "sk": trading_date,
                         "Date": existing["Date"],
                         "Ticker": existing["Ticker"],
                         "PercentChange": float(existing["PercentChange"]),
@@ -203,37 +281,36 @@ def handler(event, context):
         }
     )
 
-    for ticker in WATCHLIST[1:]:
-        try:
-            limiter.acquire()
-            date_str, o, c = _fetch_prev_day_open_close(ticker, api_key)
-
-            if date_str != trading_date:
-                raise RuntimeError(f"Date mismatch: expected {trading_date}, got {date_str}")
-
-            pct = _percent_change(o, c)
-            successes.append(
-                {
-                    "Ticker": ticker,
-                    "PercentChange": round(pct, 6),
-                    "ClosingPrice": round(c, 6),
-                }
-            )
-
-        except Exception as e:
-            failures.append({"Ticker": ticker, "Error": str(e)})
+    # Remaining tickers run concurrently; the shared limiter still spaces the
+    # outbound calls, but slow responses and retries no longer block the queue.
+    with ThreadPoolExecutor(max_workers=len(WATCHLIST) - 1) as pool:
+        futures = {
+            pool.submit(_fetch_ticker_move, ticker, api_key, trading_date, limiter): ticker
+            for ticker in WATCHLIST[1:]
+        }
+        for fut in as_completed(futures):
+            try:
+                successes.append(fut.result())
+            except Exception as e:
+                failures.append({"Ticker": futures[fut], "Error": str(e)})
 
     if failures:
         raise RuntimeError(f"One or more tickers failed; refusing to store. failures={failures}")
 
-    top = None
-    for c in successes:
-        if top is None or abs(c["PercentChange"]) > abs(top["PercentChange"]):
-            top = c
+    # Keep watchlist order so ties resolve the same way regardless of completion order
+    successes.sort(key=lambda s: WATCHLIST.index(s["Ticker"]))
 
-    if top is None:
+    if not successes:
         raise RuntimeError("Unexpected: no top mover computed")
 
+    # Single pass; strict ">" keeps the earliest watchlist ticker on ties
+    top = successes[0]
+    top_abs = abs(top["PercentChange"])
+    for c in successes[1:]:
+        a = abs(c["PercentChange"])
+        if a > top_abs:
+            top, top_abs = c, a
+
     item = {
         "pk": "MOVERS",
         "sk": trading_date,
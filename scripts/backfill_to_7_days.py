@@ -3,15 +3,19 @@
 
 import argparse
 import json
+import logging
 import os
 import random
+import threading
 import time
-from datetime import datetime, timezone, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 
 import boto3
 import urllib3
 
+logger = logging.getLogger(__name__)
 
 WATCHLIST = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA"]
 
@@ -24,23 +28,30 @@ def _require_env(name: str, default: str | None = None) -> str:
 
 
 def _sleep_jitter(seconds: float) -> None:
-    time.sleep(max(0.0, seconds) + random.uniform(0.0, 0.25))
+    time.sleep(max(0.0, seconds) + random.random() * 0.25)
 
 
 class SmoothRateLimiter:
+    # Thread-safe: the spacing applies across all worker threads (the vendor limit is per account)
     def __init__(self, spacing_seconds: float):
         self.spacing = max(0.0, float(spacing_seconds))
-        self.next_ok = time.time()
+        self.next_ok = 0.0  # first wait() never sleeps
+        self._lock = threading.Lock()
 
     def wait(self):
-        now = time.time()
-        if now < self.next_ok:
-            _sleep_jitter(self.next_ok - now)
-        self.next_ok = time.time() + self.spacing
+        with self._lock:
+            now = time.monotonic()
+            if now < self.next_ok:
+                _sleep_jitter(self.next_ok - now)
+            self.next_ok = time.monotonic() + self.spacing
+
+
+# Prebuilt quantizers for the precisions we store; other values are built on demand
+_QUANTIZERS = {2: Decimal("1.00"), 6: Decimal("1.000000")}
 
 
 def _to_ddb_number(x: float, places: int = 6) -> Decimal:
-    q = Decimal("1." + ("0" * places))
+    q = _QUANTIZERS.get(places) or Decimal("1." + ("0" * places))
     return Decimal(str(x)).quantize(q, rounding=ROUND_HALF_UP)
 
 
@@ -72,9 +83,12 @@ def _get_massive_api_key(aws_region: str) -> str:
     raise RuntimeError("Provide MASSIVE_API_KEY_PARAM (preferred) or MASSIVE_API_KEY (fallback).")
 
 
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
 def _date_str_from_epoch_ms(ms: int) -> str:
-    dt = datetime.fromtimestamp(ms / 1000.0, tz=timezone.utc)
-    return dt.strftime("%Y-%m-%d")
+    # Whole UTC days since epoch -> YYYY-MM-DD, without building a datetime or calling strftime
+    return date.fromordinal(_EPOCH_ORDINAL + ms // 86_400_000).isoformat()
 
 
 def _get_json(http: urllib3.PoolManager, url: str, max_attempts: int, max_backoff: float) -> dict:
@@ -87,26 +101,28 @@ def _get_json(http: urllib3.PoolManager, url: str, max_attempts: int, max_backof
                 timeout=urllib3.Timeout(connect=5.0, read=25.0),
                 headers={"Accept": "application/json"},
             )
-            status = resp.status
-            body = resp.data.decode("utf-8", errors="replace")
-
-            if status == 200:
-                return json.loads(body)
-
-            # retryable status codes
-            if status in (429, 500, 502, 503, 504) and attempt < max_attempts:
-                backoff = min(max_backoff, 2 ** (attempt - 1))
-                _sleep_jitter(backoff)
-                continue
-
-            raise RuntimeError(f"HTTP {status}: {body[:250]}")
+            if resp.status == 200:
+                return json.loads(resp.data)
 
         except Exception as e:
+            # network / timeout / malformed body
             last_err = e
             if attempt < max_attempts:
                 backoff = min(max_backoff, 2 ** (attempt - 1))
                 _sleep_jitter(backoff)
                 continue
+            break
+
+        status = resp.status
+
+        # retryable status codes
+        if status in (429, 500, 502, 503, 504) and attempt < max_attempts:
+            backoff = min(max_backoff, 2 ** (attempt - 1))
+            _sleep_jitter(backoff)
+            continue
+
+        body = resp.data.decode("utf-8", errors="replace")
+        raise RuntimeError(f"HTTP {status}: {body[:250]}")
 
     raise RuntimeError(f"Request failed after retries: {last_err}")
 
@@ -153,12 +169,16 @@ def fetch_day(
     date_yyyy_mm_dd: str,
     max_attempts: int,
     max_backoff: float,
+    abort: threading.Event | None = None,
 ) -> tuple[float, float, str]:
     url = (
         f"{base_url}/v2/aggs/ticker/{symbol}/range/1/day/{date_yyyy_mm_dd}/{date_yyyy_mm_dd}"
         f"?adjusted=true&apiKey={api_key}"
     )
     limiter.wait()
+    # Another symbol for this date already failed; don't spend vendor quota on a discarded result
+    if abort is not None and abort.is_set():
+        raise RuntimeError(f"Skipped {symbol} on {date_yyyy_mm_dd}: aborted after an earlier failure")
     data = _get_json(http, url, max_attempts=max_attempts, max_backoff=max_backoff)
 
     results = data.get("results") or []
@@ -172,9 +192,57 @@ def fetch_day(
     return o, c, actual_date
 
 
-def already_exists(table, date_str: str) -> bool:
-    resp = table.get_item(Key={"pk": "MOVERS", "sk": date_str})
-    return "Item" in resp
+def symbol_move(
+    http: urllib3.PoolManager,
+    limiter: SmoothRateLimiter,
+    base_url: str,
+    api_key: str,
+    symbol: str,
+    date_yyyy_mm_dd: str,
+    max_attempts: int,
+    max_backoff: float,
+    abort: threading.Event,
+) -> tuple[str, float, float]:
+    o, c, actual_date = fetch_day(
+        http=http,
+        limiter=limiter,
+        base_url=base_url,
+        api_key=api_key,
+        symbol=symbol,
+        date_yyyy_mm_dd=date_yyyy_mm_dd,
+        max_attempts=max_attempts,
+        max_backoff=max_backoff,
+        abort=abort,
+    )
+
+    if actual_date != date_yyyy_mm_dd:
+        raise RuntimeError(f"Date mismatch: asked {date_yyyy_mm_dd} got {actual_date} for {symbol}")
+
+    if o == 0:
+        raise RuntimeError(f"Open price is 0 for {symbol} on {date_yyyy_mm_dd}; cannot compute percent change")
+
+    pct = ((c - o) / o) * 100.0
+    return symbol, pct, c
+
+
+def existing_dates(dynamodb, table_name: str, dates: list[str]) -> set[str]:
+    """Return the subset of dates that already have a record, using BatchGetItem (max 100 keys per call)."""
+    found: set[str] = set()
+    for i in range(0, len(dates), 100):
+        request = {
+            table_name: {
+                "Keys": [{"pk": "MOVERS", "sk": d} for d in dates[i : i + 100]],
+                "ProjectionExpression": "sk",
+            }
+        }
+        while request:
+            resp = dynamodb.batch_get_item(RequestItems=request)
+            found.update(it["sk"] for it in resp["Responses"].get(table_name, []))
+            # Throttled keys come back as UnprocessedKeys; retry them after a short pause
+            request = resp.get("UnprocessedKeys") or None
+            if request:
+                _sleep_jitter(0.5)
+    return found
 
 
 def put_winner(table, date_str: str, ticker: str, pct: float, close: float) -> None:
@@ -199,6 +267,8 @@ def main():
     parser.add_argument("--days", type=int, default=7, help="How many trading days to backfill (default 7).")
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     aws_region = os.environ.get("AWS_REGION", "us-west-2")
     table_name = _require_env("TABLE_NAME")
     base_url = os.environ.get("MASSIVE_BASE_URL", "https://api.massive.com").rstrip("/")
@@ -209,7 +279,8 @@ def main():
 
     api_key = _get_massive_api_key(aws_region)
 
-    http = urllib3.PoolManager()
+    # One pooled connection per worker thread, reused across all requests
+    http = urllib3.PoolManager(maxsize=len(WATCHLIST))
     limiter = SmoothRateLimiter(request_spacing)
 
     dynamodb = boto3.resource("dynamodb", region_name=aws_region)
@@ -226,42 +297,58 @@ def main():
         max_backoff=max_backoff,
     )
 
-    print("Target trading dates (oldest -> newest):")
+    logger.info("Target trading dates (oldest -> newest):")
     for d in dates:
-        print(" ", d)
-
-    for d in dates:
-        if already_exists(table, d):
-            print(f"[SKIP] {d} already exists")
-            continue
+        logger.info("  %s", d)
 
-        moves = []
-        for sym in WATCHLIST:
-            o, c, actual_date = fetch_day(
-                http=http,
-                limiter=limiter,
-                base_url=base_url,
-                api_key=api_key,
-                symbol=sym,
-                date_yyyy_mm_dd=d,
-                max_attempts=max_attempts,
-                max_backoff=max_backoff,
-            )
-
-            if actual_date != d:
-                raise RuntimeError(f"Date mismatch: asked {d} got {actual_date} for {sym}")
-
-            if o == 0:
-                raise RuntimeError(f"Open price is 0 for {sym} on {d}; cannot compute percent change")
+    existing = existing_dates(dynamodb, table_name, dates)
 
-            pct = ((c - o) / o) * 100.0
-            moves.append((sym, pct, c))
-
-        winner = max(moves, key=lambda x: abs(x[1]))
-        print(f"[WRITE] {d} winner={winner[0]} pct={winner[1]:.4f} close={winner[2]:.2f}")
-        put_winner(table, d, winner[0], winner[1], winner[2])
+    # Symbols for a date are fetched concurrently; the shared limiter keeps the
+    # request spacing global, so only network latency and retries overlap.
+    with ThreadPoolExecutor(max_workers=len(WATCHLIST)) as pool:
+        for d in dates:
+            if d in existing:
+                logger.info("[SKIP] %s already exists", d)
+                continue
 
-    print("Backfill complete.")
+            abort = threading.Event()
+            futures = [
+                pool.submit(
+                    symbol_move,
+                    http=http,
+                    limiter=limiter,
+                    base_url=base_url,
+                    api_key=api_key,
+                    symbol=sym,
+                    date_yyyy_mm_dd=d,
+                    max_attempts=max_attempts,
+                    max_backoff=max_backoff,
+                    abort=abort,
+                )
+                for sym in WATCHLIST
+            ]
+            # Any failure raises here (all-or-nothing per day). Workers still queued on the
+            # limiter see the abort flag and skip their HTTP call instead of fetching.
+            try:
+                moves = [f.result() for f in as_completed(futures)]
+            except Exception:
+                abort.set()
+                raise
+            # Watchlist order keeps tie-breaking independent of completion order
+            moves.sort(key=lambda m: WATCHLIST.index(m[0]))
+
+            # Largest absolute move; strict ">" keeps the earliest watchlist symbol on ties
+            best_sym, best_pct, best_c = moves[0]
+            best_abs = abs(best_pct)
+            for sym, pct, c in moves[1:]:
+                a = abs(pct)
+                if a > best_abs:
+                    best_sym, best_pct, best_c, best_abs = sym, pct, c, a
+
+            logger.info("[WRITE] %s winner=%s pct=%.4f close=%.2f", d, best_sym, best_pct, best_c)
+            put_winner(table, d, best_sym, best_pct, best_c)
+
+    logger.info("Backfill complete.")
 
 
 if __name__ == "__main__":